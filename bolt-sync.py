@@ -8,13 +8,37 @@ a remote Bolt.new project. Supports pull and push operations.
 
 import argparse
 import difflib
+import gzip
+import hashlib
+import io
 import json
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    # zstandard is optional; fall back to gzip for backups
+    zstandard = None
+
+try:
+    import pygit2
+except ImportError:
+    # pygit2 is optional; fall back to difflib for diffs
+    pygit2 = None
 
 # Default lists of directories and files to exclude
 DEFAULT_EXCLUDE_DIRS = ["venv", "__pycache__", "node_modules", ".next", ".idea"]
@@ -22,13 +46,53 @@ DEFAULT_IGNORE_FILES = ["package.json", "next.config.js"]
 DEFAULT_SKIP_WHEN_PUSHING = ["next-env.d.ts", "yarn.lock", ".dockerignore"]
 DEFAULT_SKIP_WHEN_PULLING = [".env", "package-lock.json"]
 
-def getattr_recursive(obj, attr_path):
-    """Recursively get attributes from an object using dot notation."""
-    attrs = attr_path.split('.')
-    current = obj
-    for attr in attrs:
-        current = current.get(attr, {})
-    return current
+# Number of worker threads used for local file reads and writes
+IO_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Number of leading bytes checked for NUL bytes to detect binary files
+BINARY_SNIFF_SIZE = 8192
+
+# Shared HTTP session so consecutive API calls reuse pooled keep-alive connections
+_session = requests.Session()
+_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    ),
+)
+
+# Directory holding backups of remote files, and how many to keep per project
+BACKUP_DIR = Path(os.path.expanduser("~/.bolt-sync/backups"))
+MAX_BACKUPS = 10
+
+# Directory holding per-project caches of local file hashes
+CACHE_DIR = Path(os.path.expanduser("~/.bolt-sync/cache"))
+
+# Directory holding per-project hashes of local files that needed no push at the last push
+STATE_DIR = Path(os.path.expanduser("~/.bolt-sync/state"))
+
+def _json_dumps(obj, indent=False) -> bytes:
+    """Serialize obj to JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+def _json_loads(data):
+    """Deserialize JSON from bytes or str, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class ApiError(ValueError):
+    """Raised when the API responds with an error status code."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
 
 def fetch_api_endpoint(endpoint: str, method: str = "get", api_key=None, **kwargs):
     """
@@ -42,7 +106,7 @@ def fetch_api_endpoint(endpoint: str, method: str = "get", api_key=None, **kwarg
     headers = kwargs.pop("headers", {}) or {}
     headers["Authorization"] = f"Bearer {api_key}"
     
-    response = requests.request(
+    response = _session.request(
         method=method,
         url=f"https://stackblitz.com{endpoint}",
         headers=headers,
@@ -50,16 +114,19 @@ def fetch_api_endpoint(endpoint: str, method: str = "get", api_key=None, **kwarg
     )
     
     if not response.ok:
-        raise ValueError(f"API request failed: {response.status_code} - {response.text}")
+        raise ApiError(
+            response.status_code,
+            f"API request failed: {response.status_code} - {response.text}",
+        )
 
-    return response.json()
+    return _json_loads(response.content)
 
 def get_remote_files(project_id: str, api_key=None) -> dict:
     """
     Get remote Bolt.new files
     """
     response = fetch_api_endpoint(f"/api/projects/{project_id}", api_key=api_key)
-    return getattr_recursive(response, "project.appFiles")
+    return response.get("project", {}).get("appFiles", {})
 
 def process_file_changes(file_changes: dict[str, str], action_type: str, dry_run=False):
     """
@@ -77,75 +144,304 @@ def process_file_changes(file_changes: dict[str, str], action_type: str, dry_run
         
     return True
 
-def modify_remote_files(project_id: str, file_changes: dict[str, str], api_key=None, dry_run=False):
+def patch_remote_files(project_id: str, app_files: dict, api_key=None):
     """
-    Modify remote files, with confirmation for each file
+    Send the given appFiles entries to the remote project
+    """
+    fetch_api_endpoint(
+        f"/api/projects/{project_id}",
+        method="patch",
+        api_key=api_key,
+        data=_json_dumps({"project": {"appFiles": app_files}}),
+        headers={"Content-Type": "application/json"},
+    )
+
+def save_backup(project_id: str, remote_files: dict, current_ts: int) -> Path:
+    """
+    Save a compressed backup of the remote files, keeping only the
+    MAX_BACKUPS most recent backups of the project.
+    Backups are compressed with zstandard if installed, otherwise with gzip.
+    """
+    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+    prefix = f"remote_files_{project_id}_"
+    data = _json_dumps(remote_files)
+
+    if zstandard is not None:
+        backup_file = BACKUP_DIR / f"{prefix}{current_ts}.json.zst"
+        data = zstandard.ZstdCompressor(level=3).compress(data)
+    else:
+        backup_file = BACKUP_DIR / f"{prefix}{current_ts}.json.gz"
+        data = gzip.compress(data, compresslevel=6)
+
+    with open(backup_file, "wb") as outfile:
+        outfile.write(data)
+
+    # Remove the oldest backups of this project
+    backups = sorted(
+        (
+            path for path in BACKUP_DIR.iterdir()
+            if path.name.startswith(prefix)
+            and path.name[len(prefix):].split(".")[0].isdigit()
+        ),
+        key=lambda path: int(path.name[len(prefix):].split(".")[0]),
+    )
+    for old_backup in backups[:-MAX_BACKUPS]:
+        old_backup.unlink()
+
+    return backup_file
+
+def prepare_remote_update(project_id: str, remote_files: dict, file_changes: dict[str, str], current_ts: int):
+    """
+    Back up the remote files and build the updated appFiles entries for the
+    changed files that exist remotely.
+    Returns the updated entries and the path of the backup.
     """
-    if not process_file_changes(file_changes, "push", dry_run):
-        return
-        
-    current_remote_files = get_remote_files(project_id, api_key=api_key)
-    current_ts = int(time.time())
-    
     # Optional: Save a backup of current remote files
-    backup_dir = Path(os.path.expanduser("~/.bolt-sync/backups"))
-    backup_dir.mkdir(parents=True, exist_ok=True)
-    backup_file = backup_dir / f"remote_files_{project_id}_{current_ts}.json"
-    with open(backup_file, "w") as outfile:
-        json.dump(current_remote_files, outfile)
-        print(f"Backup of remote files saved to {backup_file}")
-
-    # Update file contents
+    backup_file = save_backup(project_id, remote_files, current_ts)
+
+    changed_files = {}
     for path, new_content in file_changes.items():
-        remote_file = current_remote_files.get(path)
+        remote_file = remote_files.get(path)
         if not remote_file:
             print(f"File {path} not found in remote project - adding is currently not supported")
             continue
 
-        remote_file["contents"] = new_content
-        remote_file["lastModified"] = current_ts
+        changed_files[path] = {**remote_file, "contents": new_content, "lastModified": current_ts}
+    return changed_files, backup_file
+
+def modify_remote_files(
+    project_id: str,
+    file_changes: dict[str, str],
+    api_key=None,
+    dry_run=False,
+    remote_files: dict = None,
+    partial_patch=False,
+):
+    """
+    Modify remote files.
+    By default the remote files are fetched again right before the update and
+    sent back in full, so remote edits made in the meantime are not overwritten.
+    With partial_patch, only the changed entries are sent, based on remote_files
+    if given; if the API rejects the partial update, all files are sent instead.
+    Returns True if the changes were pushed.
+    """
+    if not process_file_changes(file_changes, "push", dry_run):
+        return False
+        
+    current_ts = int(time.time())
+
+    if not partial_patch or remote_files is None:
+        remote_files = get_remote_files(project_id, api_key=api_key)
+    changed_files, backup_file = prepare_remote_update(project_id, remote_files, file_changes, current_ts)
+    print(f"Backup of remote files saved to {backup_file}")
+
+    if not changed_files:
+        print("No changes to push.")
+        return False
 
     # Push changes to remote
-    fetch_api_endpoint(
-        f"/api/projects/{project_id}",
-        method="patch",
-        api_key=api_key,
-        json={"project": {"appFiles": current_remote_files}},
-    )
+    send_all = not partial_patch
+    if partial_patch:
+        try:
+            patch_remote_files(project_id, changed_files, api_key=api_key)
+        except ApiError as e:
+            if not 400 <= e.status_code < 500:
+                raise
+            print(f"Partial update rejected ({e.status_code}), pushing all files instead.")
+            remote_files = get_remote_files(project_id, api_key=api_key)
+            changed_files, backup_file = prepare_remote_update(
+                project_id, remote_files, file_changes, current_ts
+            )
+            print(f"Backup of refreshed remote files saved to {backup_file}")
+            send_all = True
+
+    if send_all:
+        remote_files.update(changed_files)
+        patch_remote_files(project_id, remote_files, api_key=api_key)
     print("Successfully pushed changes to remote project.")
+    return True
+
+def _walk(dir_path: str, rel: str, exclude_dirs: frozenset, skip_files: frozenset = frozenset()):
+    """
+    Yield (relative path, absolute path) pairs for all files below dir_path.
+    Excluded directories are skipped before recursing, so they are never scanned,
+    and files whose relative path is in skip_files are left out.
+    """
+    try:
+        entries = os.scandir(dir_path)
+    except (PermissionError, NotADirectoryError):
+        # Skip unreadable directories (and a local_dir that is a file) like pathlib's rglob
+        return
+
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name in exclude_dirs:
+                    continue
+                yield from _walk(entry.path, rel + entry.name + "/", exclude_dirs, skip_files)
+            elif entry.is_file():
+                rel_path = rel + entry.name
+                if rel_path not in skip_files:
+                    yield rel_path, entry.path
+
+def _read_one(file_path: str):
+    """
+    Read a single file as UTF-8 text, returning None for files that cannot be decoded.
+    Files with a NUL byte in their first BINARY_SNIFF_SIZE bytes are treated as
+    binary and skipped without reading the rest.
+    """
+    with open(file_path, "rb") as f:
+        head = f.read(BINARY_SNIFF_SIZE)
+        if b"\x00" in head:
+            return None
+        data = head + f.read()
+
+    try:
+        content = data.decode("utf-8")
+    except UnicodeDecodeError:
+        # Skip files that cannot be read as text (likely binary files)
+        return None
+    # Translate newlines the same way text mode does
+    return content.replace("\r\n", "\n").replace("\r", "\n")
+
+def hash_content(content: str) -> str:
+    """Return the hash used to compare file contents."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def load_hash_cache(project_id: str) -> dict:
+    """
+    Load the cached local file hashes for a project.
+    Entries map relative file paths to [mtime_ns, size, hash].
+    """
+    cache_file = CACHE_DIR / f"{project_id}.json"
+    try:
+        with open(cache_file, "rb") as f:
+            return _json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+def save_hash_cache(project_id: str, cache: dict):
+    """
+    Save the local file hashes for a project
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_DIR / f"{project_id}.json", "wb") as f:
+        f.write(_json_dumps(cache))
+
+def load_push_state(project_id: str, local_dir: str) -> dict:
+    """
+    Load the local file entries recorded at the last push of a project from local_dir.
+    Entries map relative file paths to [mtime_ns, size, hash]; files still matching
+    their entry were in sync with the remote or had nothing to push.
+    """
+    state_file = STATE_DIR / f"{project_id}.json"
+    try:
+        with open(state_file, "rb") as f:
+            state = _json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+    # State recorded for another local directory says nothing about this one
+    if state.get("local_dir") != str(Path(local_dir).resolve()):
+        return {}
+    return state.get("files", {})
+
+def save_push_state(project_id: str, local_dir: str, files: dict):
+    """
+    Save the local file entries recorded at a push of a project from local_dir
+    """
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    state = {"local_dir": str(Path(local_dir).resolve()), "files": files}
+    with open(STATE_DIR / f"{project_id}.json", "wb") as f:
+        f.write(_json_dumps(state))
+
+def forget_push_state(project_id: str, local_dir: str, paths):
+    """
+    Drop the push state entries of the given files, e.g. after they were overwritten by a pull
+    """
+    files = load_push_state(project_id, local_dir)
+    if not files:
+        return
+    for path in paths:
+        files.pop(path, None)
+    save_push_state(project_id, local_dir, files)
 
-def get_local_files(local_dir: str, exclude_dirs: list = None) -> dict:
+def _hash_one(file_path: str, cached_entry):
     """
-    Recursively read all text files in the given local directory using pathlib.
-    Optionally excludes files located in directories whose names are in exclude_dirs.
-    Returns a dict mapping relative file paths to file contents.
+    Return the [mtime_ns, size, hash] entry for a file, re-reading it only
+    if its mtime or size changed since the cached entry was recorded.
+    Returns None for binary files and files removed since the directory walk.
     """
-    exclude_dirs = exclude_dirs or []
-    local_files = {}
+    try:
+        stat = os.stat(file_path)
+        if cached_entry and cached_entry[0] == stat.st_mtime_ns and cached_entry[1] == stat.st_size:
+            return cached_entry
+
+        content = _read_one(file_path)
+    except FileNotFoundError:
+        # Temporary files (editor swap files, build output) can vanish after the walk
+        return None
+    if content is None:
+        return None
+    return [stat.st_mtime_ns, stat.st_size, hash_content(content)]
+
+def get_local_files(
+    local_dir: str, exclude_dirs=None, project_id: str = None, skip_files=None
+) -> dict:
+    """
+    Recursively hash all text files in the given local directory.
+    Optionally excludes files located in directories whose names are in exclude_dirs,
+    and files whose relative paths are in skip_files, without reading them.
+    When project_id is given, hashes are cached by file mtime and size so
+    unchanged files are not read again on the next run.
+    Returns a dict mapping relative file paths to [mtime_ns, size, hash].
+    """
+    exclude_dirs = frozenset(exclude_dirs or ())
+    skip_files = frozenset(skip_files or ())
     base_path = Path(local_dir)
     
     if not base_path.exists():
         raise ValueError(f"Local directory '{local_dir}' does not exist")
-        
-    for file_path in base_path.rglob("*"):
-        if file_path.is_file():
-            # Check if any directory in the file's relative path is in the exclude list
-            if any(
-                excluded in file_path.relative_to(base_path).parts
-                for excluded in exclude_dirs
-            ):
-                continue
-            try:
-                content = file_path.read_text(encoding="utf-8")
-                rel_path = str(file_path.relative_to(base_path))
-                local_files[rel_path] = content
-            except UnicodeDecodeError:
-                # Skip files that cannot be read as text (likely binary files)
-                continue
-    return local_files
+
+    file_paths = list(_walk(str(base_path), "", exclude_dirs, skip_files))
+    cache = load_hash_cache(project_id) if project_id else {}
+
+    # File reads release the GIL, so a thread pool overlaps the I/O latency
+    with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+        entries = executor.map(
+            _hash_one,
+            [abs_path for _, abs_path in file_paths],
+            [cache.get(rel_path) for rel_path, _ in file_paths],
+        )
+        new_cache = {
+            rel_path: entry
+            for (rel_path, _), entry in zip(file_paths, entries)
+            if entry is not None
+        }
+
+    if project_id:
+        save_hash_cache(project_id, new_cache)
+
+    return new_cache
+
+def read_local_file(local_dir: str, path: str):
+    """
+    Read the contents of a single local file, or None if it is not a text file
+    """
+    return _read_one(os.path.join(local_dir, path))
 
 def show_diff(remote_content, local_content, file_path):
     """Show unified diff between remote and local content."""
+    if pygit2 is not None:
+        # libgit2's C diff is much faster than difflib on large files.
+        # Replace its git-style header with the same one difflib produces.
+        # Files libgit2 treats as binary have no hunks; those fall through to difflib.
+        patch_text = pygit2.Patch.create_from(remote_content, local_content).text
+        hunks_start = patch_text.find("\n@@")
+        if hunks_start != -1:
+            hunks = patch_text[hunks_start + 1:].rstrip("\n")
+            return f"--- remote/{file_path}\n+++ local/{file_path}\n{hunks}"
+
     diff = difflib.unified_diff(
         remote_content.splitlines(),
         local_content.splitlines(),
@@ -155,23 +451,28 @@ def show_diff(remote_content, local_content, file_path):
     )
     return "\n".join(diff)
 
-def print_file_list(title, files):
+def print_file_list(title, files, out=None):
     """
-    Helper function to print a list of files with a title
+    Helper function to print an already sorted list of files with a title.
+    Output goes to out if given, otherwise to stdout.
     """
     if not files:
         return
         
-    print(f"\n{title}:")
-    for file in sorted(files):
-        print(f"  - {file}")
+    print(f"\n{title}:", file=out)
+    for file in files:
+        print(f"  - {file}", file=out)
 
-def compare_files(remote_files: dict, local_files: dict, show_diffs=True):
+def compare_files(
+    remote_files: dict, remote_hashes: dict, local_files: dict, local_dir: str, show_diffs=True
+):
     """
-    Compare the remote and local files.
+    Compare the remote file hashes with the local file hashes.
+    Contents are only looked up in remote_files (the remote appFiles) and on
+    disk for files that differ.
     Prints differences for files that exist in both, and lists files missing in either side.
     """
-    remote_set = set(remote_files.keys())
+    remote_set = set(remote_hashes.keys())
     local_set = set(local_files.keys())
 
     common_files = remote_set & local_set
@@ -181,24 +482,37 @@ def compare_files(remote_files: dict, local_files: dict, show_diffs=True):
     diff_count = 0
     modified_files = []
 
-    print_file_list("Remote files not found locally", remote_only)
-    print_file_list("Local files not present remotely", local_only)
+    # Collect all output and write it at once instead of flushing line by line
+    out = io.StringIO()
+
+    # Sorted once here; modified_files inherits the order of common_files
+    print_file_list("Remote files not found locally", sorted(remote_only), out)
+    print_file_list("Local files not present remotely", sorted(local_only), out)
 
     if common_files:
         for file in sorted(common_files):
-            remote_content = remote_files[file]
-            local_content = local_files[file]
-            if remote_content != local_content:
-                diff_count += 1
-                modified_files.append(file)
-                if show_diffs:
-                    print(f"\nFile '{file}' differs between remote and local:")
-                    print(show_diff(remote_content, local_content, file))
+            remote_hash = remote_hashes[file]
+            local_hash = local_files[file]
+            # Equal hashes mean equal contents, so there is nothing to diff
+            if remote_hash == local_hash:
+                continue
+
+            diff_count += 1
+            modified_files.append(file)
+            if show_diffs:
+                local_content = read_local_file(local_dir, file) or ""
+                diff = show_diff(remote_files[file]["contents"], local_content, file)
+                out.write(f"\nFile '{file}' differs between remote and local:\n")
+                out.write(diff)
+                out.write("\n")
     
     if diff_count == 0 and not remote_only and not local_only:
-        print("All files are in sync. No differences found.")
+        out.write("All files are in sync. No differences found.\n")
     elif diff_count > 0 and not show_diffs:
-        print_file_list(f"{diff_count} modified files", modified_files)
+        print_file_list(f"{diff_count} modified files", modified_files, out)
+
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
     
     return {
         "common": common_files,
@@ -207,55 +521,63 @@ def compare_files(remote_files: dict, local_files: dict, show_diffs=True):
         "modified": modified_files
     }
 
-def generate_diff_files(
-    source_files: dict, target_files: dict, source_name: str
-) -> dict[str, str]:
+def generate_diff_files(remote_hashes: dict, local_hashes: dict) -> list[str]:
     """
-    Generic function to generate diff between two file collections
+    Generic function to find files whose contents differ between remote and local
     
     Args:
-        source_files: The source files with content to use
-        target_files: The target files to compare against
-        source_name: Name of source ("local" or "remote")
+        remote_hashes: The content hashes of the remote files
+        local_hashes: The content hashes of the local files
         
     Returns:
-        Dict of modified files where content from source_files differs from target_files
+        List of paths present on both sides where the content hashes differ
     """
-    modified_files = {}
-    for path, source_content in source_files.items():
-        if path not in target_files:
-            continue
-
-        target_content = target_files[path]
-        if source_content != target_content:
-            modified_files[path] = source_content
-
-    return modified_files
+    return [
+        path
+        for path, local_hash in local_hashes.items()
+        if path in remote_hashes and remote_hashes[path] != local_hash
+    ]
 
 def generate_diff_for_locally_modified_files(
-    remote_files: dict, local_files: dict
+    remote_hashes: dict, local_files: dict, local_dir: str
 ) -> dict[str, str]:
     """
     Get dict of modified files (local changes to push)
     """
-    return generate_diff_files(local_files, remote_files, "local")
+    modified_files = {}
+    for path in generate_diff_files(remote_hashes, local_files):
+        content = read_local_file(local_dir, path)
+        if content is not None:
+            modified_files[path] = content
+    return modified_files
 
 def generate_diff_for_remote_modified_files(
-    remote_files: dict, local_files: dict
+    remote_files: dict, remote_hashes: dict, local_files: dict
 ) -> dict[str, str]:
     """
     Get dict of modified files from remote (to pull)
     """
-    return generate_diff_files(remote_files, local_files, "remote")
+    return {
+        path: remote_files[path]["contents"]
+        for path in generate_diff_files(remote_hashes, local_files)
+    }
 
 def remove_files(all_files: dict[str, str], remove_files: list[str]) -> dict[str, str]:
     """
     Remove specified files from a dict of files
     """
+    skip = frozenset(remove_files)
     return {
-        path: content for path, content in all_files.items() if path not in remove_files
+        path: content for path, content in all_files.items() if path not in skip
     }
 
+def _write_one(file_path: Path, contents: str):
+    """
+    Write a single local file. Its parent directory must already exist.
+    """
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(contents)
+
 def modify_or_add_local_files(local_dir: str, file_changes: dict[str, str], dry_run=False):
     """
     Modify or add local files
@@ -264,15 +586,20 @@ def modify_or_add_local_files(local_dir: str, file_changes: dict[str, str], dry_
         return
         
     base_dir = Path(local_dir)
-    for path, contents in file_changes.items():
-        file_path = base_dir / path
-        
-        # Create parent directories if they don't exist
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Write file content
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(contents)
+    file_paths = [base_dir / path for path in file_changes]
+
+    # Create each parent directory once, shallowest first, before writing
+    parent_dirs = {file_path.parent for file_path in file_paths}
+    for parent_dir in sorted(parent_dirs, key=lambda d: len(d.parts)):
+        parent_dir.mkdir(parents=True, exist_ok=True)
+
+    # File writes release the GIL, so a thread pool overlaps the I/O latency
+    with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+        list(executor.map(
+            _write_one,
+            file_paths,
+            file_changes.values(),
+        ))
             
     print(f"Successfully pulled {len(file_changes)} file(s) to {local_dir}")
 
@@ -306,8 +633,8 @@ def load_config(config_file=None):
         return default_config
         
     try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
+        with open(config_path, 'rb') as f:
+            config = _json_loads(f.read())
             
         # Merge with defaults for any missing keys
         for key in default_config:
@@ -319,24 +646,42 @@ def load_config(config_file=None):
         print(f"Error loading config: {e}")
         return default_config
 
-def get_source_files(args, config):
+def get_remote_source_files(args, config):
     """
-    Common function to retrieve and process both remote and local files
+    Retrieve the remote appFiles and the hashes of the remote source files
     """
-    # Get remote files
     app_files = get_remote_files(args.project_id, api_key=args.api_key)
-    remote_source_files = {
-        path: details["contents"]
+    # Only hashes are kept up front; contents stay in app_files until needed
+    remote_hashes = {
+        path: hash_content(details["contents"])
         for path, details in app_files.items()
         if details.get("type") == "file" and not details.get("isBinary")
     }
-    remote_source_files = remove_files(remote_source_files, config["skip_when_pulling"])
-    
-    # Get local files
-    local_source_files = get_local_files(args.local_dir, exclude_dirs=config["exclude_dirs"])
-    local_source_files = remove_files(local_source_files, config["skip_when_pushing"])
-    
-    return remote_source_files, local_source_files
+    remote_hashes = remove_files(remote_hashes, config["skip_when_pulling"])
+    return app_files, remote_hashes
+
+def get_local_source_files(args, config):
+    """
+    Retrieve the [mtime_ns, size, hash] entries of the local source files
+    """
+    return get_local_files(
+        args.local_dir,
+        exclude_dirs=frozenset(config["exclude_dirs"]),
+        project_id=args.project_id,
+        skip_files=frozenset(config["skip_when_pushing"]),
+    )
+
+def get_source_files(args, config):
+    """
+    Common function to retrieve and process both remote and local files
+    """
+    # The remote fetch is network-bound and the local scan disk-bound, so run them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        remote_future = executor.submit(get_remote_source_files, args, config)
+        local_future = executor.submit(get_local_source_files, args, config)
+        app_files, remote_hashes = remote_future.result()
+        local_entries = local_future.result()
+    return app_files, remote_hashes, local_entries
 
 def push_command(args):
     """
@@ -345,26 +690,72 @@ def push_command(args):
     config = load_config(args.config)
     
     try:
-        # Get source files
-        remote_source_files, local_source_files = get_source_files(args, config)
+        push_state = load_push_state(args.project_id, args.local_dir)
+        if push_state:
+            # Get local files first: files unchanged since the last push need no remote data.
+            # A file only counts as unchanged if its mtime, size and hash all match.
+            local_entries = get_local_source_files(args, config)
+            unchanged_files = {
+                path for path, entry in local_entries.items()
+                if push_state.get(path) == entry
+            }
+            if len(unchanged_files) == len(local_entries):
+                print("No local changes since the last push.")
+                return 0
+            app_files, remote_hashes = get_remote_source_files(args, config)
+        else:
+            app_files, remote_hashes, local_entries = get_source_files(args, config)
+            unchanged_files = set()
+
+        local_source_files = {
+            path: entry[2] for path, entry in local_entries.items() if path not in unchanged_files
+        }
+        remote_hashes = remove_files(remote_hashes, unchanged_files)
         
         # Compare files
         print(f"Comparing local files with remote project '{args.project_id}'...\n")
-        compare_files(remote_source_files, local_source_files, show_diffs=not args.no_diff)
+        compare_files(
+            app_files,
+            remote_hashes,
+            local_source_files,
+            args.local_dir,
+            show_diffs=not args.no_diff,
+        )
         
         # Generate changes to push
         modified_files = generate_diff_for_locally_modified_files(
-            remote_files=remote_source_files, local_files=local_source_files
+            remote_hashes=remote_hashes, local_files=local_source_files, local_dir=args.local_dir
         )
         
+        # Files that are in sync or only exist locally have nothing to push
+        new_push_state = {path: push_state[path] for path in unchanged_files}
+        new_push_state.update(
+            (path, local_entries[path])
+            for path in local_source_files
+            if path not in modified_files
+        )
+
         # Push changes if confirmed
         if modified_files:
             if args.yes or confirm_action(modified_files, "push"):
-                modify_remote_files(args.project_id, modified_files, api_key=args.api_key, dry_run=args.dry_run)
+                pushed = modify_remote_files(
+                    args.project_id,
+                    modified_files,
+                    api_key=args.api_key,
+                    dry_run=args.dry_run,
+                    remote_files=app_files,
+                    partial_patch=args.partial_patch,
+                )
+                if pushed:
+                    new_push_state.update(
+                        (path, local_entries[path]) for path in modified_files
+                    )
             else:
                 print("Push cancelled.")
         else:
             print("No files to push.")
+
+        save_push_state(args.project_id, args.local_dir, new_push_state)
             
     except Exception as e:
         print(f"Error during push operation: {e}")
@@ -380,26 +771,38 @@ def pull_command(args):
     
     try:
         # Get source files
-        remote_source_files, local_source_files = get_source_files(args, config)
+        app_files, remote_hashes, local_entries = get_source_files(args, config)
+        local_source_files = {path: entry[2] for path, entry in local_entries.items()}
         
         # Compare files
         print(f"Comparing remote project '{args.project_id}' with local files...\n")
-        file_comparison = compare_files(remote_source_files, local_source_files, show_diffs=not args.no_diff)
+        file_comparison = compare_files(
+            app_files,
+            remote_hashes,
+            local_source_files,
+            args.local_dir,
+            show_diffs=not args.no_diff,
+        )
         
         # Generate changes to pull
         modified_files = generate_diff_for_remote_modified_files(
-            remote_files=remote_source_files, local_files=local_source_files
+            remote_files=app_files,
+            remote_hashes=remote_hashes,
+            local_files=local_source_files,
         )
         
         # Add remote-only files by default, unless --existing-only is specified
         if not args.existing_only:
             for file in file_comparison["remote_only"]:
-                modified_files[file] = remote_source_files[file]
+                modified_files[file] = app_files[file]["contents"]
         
         # Pull changes if confirmed
         if modified_files:
             if args.yes or confirm_action(modified_files, "pull"):
                 modify_or_add_local_files(args.local_dir, modified_files, dry_run=args.dry_run)
+                if not args.dry_run:
+                    # Pulled files no longer match what was recorded at the last push
+                    forget_push_state(args.project_id, args.local_dir, modified_files)
             else:
                 print("Pull cancelled.")
         else:
@@ -429,8 +832,8 @@ def create_config_command(args):
     
     try:
         config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
+        with open(config_path, 'wb') as f:
+            f.write(_json_dumps(config, indent=True))
         print(f"Config file created at {args.output}")
     except Exception as e:
         print(f"Error creating config file: {e}")
@@ -484,6 +887,7 @@ Examples:
     push_parser.add_argument('--no-diff', action='store_true', help='Don\'t show diffs, just list modified files')
     push_parser.add_argument('--dry-run', action='store_true', help='Show what would be done without making changes')
     push_parser.add_argument('-y', '--yes', action='store_true', help='Automatically confirm all operations')
+    push_parser.add_argument('--partial-patch', action='store_true', help='Send only the changed files instead of all remote files (requires the API to merge partial updates)')
     
     # Create config command
     config_parser = subparsers.add_parser('create-config', help='Create a configuration file')